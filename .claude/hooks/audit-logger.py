@@ -7,20 +7,54 @@ Supports events: PreToolUse, PostToolUse, UserPromptSubmit, Stop
 Retention: 90 days (auto-cleanup on each run)
 """
 
+import atexit
 import json
 import os
+import re
 import sys
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
 
 RETENTION_DAYS = 90
 LOG_DIR = Path(__file__).parent.parent / "audit_logs"
 
+SENSITIVE_KEY_RE = re.compile(
+    r"password|secret|token|key|credential|auth", re.IGNORECASE
+)
+
+# Pending entries accumulate in one contiguous buffer and go out in a single
+# O_APPEND write. Appends below PIPE_BUF are atomic on Linux, so concurrent
+# hooks can share the file safely.
+FLUSH_THRESHOLD = 64 * 1024
+_pending = bytearray()
+_log_fd = -1
+_dir_ready = False
+_log_filename = ""
+
 
 def get_log_directory() -> Path:
-    """Get or create the audit logs directory."""
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    """Get or create the audit logs directory (mkdir only once per process)."""
+    global _dir_ready
+
+    if not _dir_ready:
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        _dir_ready = True
     return LOG_DIR
 
 
@@ -30,20 +64,38 @@ def get_iso_timestamp() -> str:
 
 
 def get_log_filename() -> str:
-    """Get today's log filename."""
-    return datetime.now(timezone.utc).strftime("%Y%m%d_audit.jsonl")
+    """Get today's log filename (computed once; hooks are short-lived)."""
+    global _log_filename
+
+    if not _log_filename:
+        _log_filename = datetime.now(timezone.utc).strftime("%Y%m%d_audit.jsonl")
+    return _log_filename
 
 
 def parse_event_data() -> dict:
     """Parse event data from stdin."""
+    raw = sys.stdin.buffer.read()
+    if not raw:
+        return {}
     try:
-        return json.loads(sys.stdin.read())
-    except json.JSONDecodeError:
+        return _loads(raw)
+    except ValueError:
         return {}
 
 
 def rotate_old_logs(log_dir: Path) -> None:
-    """Remove log files older than retention period."""
+    """Remove log files older than retention period.
+
+    The retention horizon only moves once per day, so the directory scan is
+    gated on a marker file instead of running on every hook invocation.
+    """
+    marker = log_dir / ".last_rotate"
+    try:
+        if time.time() - marker.stat().st_mtime < 86400:
+            return
+    except OSError:
+        pass
+
     cutoff_date = datetime.now(timezone.utc) - timedelta(days=RETENTION_DAYS)
 
     for log_file in log_dir.glob("*_audit.jsonl"):
@@ -57,26 +109,59 @@ def rotate_old_logs(log_dir: Path) -> None:
         except (ValueError, IndexError):
             pass
 
+    marker.touch()
+
+
+def _get_log_fd() -> int:
+    """Open the log file once per process and reuse the fd across flushes."""
+    global _log_fd
+
+    if _log_fd < 0:
+        log_file = get_log_directory() / get_log_filename()
+        _log_fd = os.open(
+            log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC, 0o644
+        )
+    return _log_fd
+
+
+def flush_pending_entries() -> None:
+    """Flush buffered entries to the log file in a single write syscall."""
+    if not _pending:
+        return
+
+    os.write(_get_log_fd(), _pending)
+    _pending.clear()
+
+
+def _close_log() -> None:
+    global _log_fd
+
+    flush_pending_entries()
+    if _log_fd >= 0:
+        os.close(_log_fd)
+        _log_fd = -1
+
+
+atexit.register(_close_log)
+
 
 def write_audit_entry(log_dir: Path, entry: dict) -> None:
-    """Write a single audit entry to the log file."""
-    log_file = log_dir / get_log_filename()
+    """Buffer an audit entry; flushed at exit or once 64 KB accumulates."""
+    _pending.extend(_dumps(entry))
+    _pending.extend(b"\n")
 
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+    if len(_pending) >= FLUSH_THRESHOLD:
+        flush_pending_entries()
 
 
 def sanitize_tool_input(tool_input: dict) -> dict:
     """Remove sensitive data from tool input before logging."""
     sanitized = {}
 
-    sensitive_keys = ["password", "secret", "token", "key", "credential", "auth"]
-
     for key, value in tool_input.items():
-        key_lower = key.lower()
-        if any(s in key_lower for s in sensitive_keys):
+        if SENSITIVE_KEY_RE.search(key):
             sanitized[key] = "[REDACTED]"
-        elif isinstance(value, str) and len(value) > 1000:
+        elif type(value) is str and len(value) > 1000:
             sanitized[key] = value[:500] + f"...[truncated {len(value)} chars]"
         else:
             sanitized[key] = value
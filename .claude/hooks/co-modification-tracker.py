@@ -10,34 +10,57 @@ FIFO rotation prioritizes high-frequency pairs when storage limit is reached.
 """
 
 import json
+import mmap
 import os
 import sys
 from datetime import datetime, timezone
 from itertools import combinations
+from operator import itemgetter
 from pathlib import Path
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
 CLAUDE_PROJECT_DIR = os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())
 MEMORY_DIR = Path(CLAUDE_PROJECT_DIR) / ".claude" / "memory"
 TSC_CACHE_DIR = Path(CLAUDE_PROJECT_DIR) / ".claude" / "tsc-cache"
 
 COMODS_FILE = MEMORY_DIR / "co-modifications.json"
+INDEX_FILE = MEMORY_DIR / "index.json"
+MEMORY_FILE = MEMORY_DIR / "memory.json"
 MAX_ENTRIES = 50
 
+_PAIR_SORT_KEY = itemgetter("frequency", "last_seen")
+
 
 def load_json(file_path: Path, default: dict) -> dict:
     if not file_path.exists():
         return default
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
+        with open(file_path, "rb") as f:
+            return _loads(f.read())
+    except (ValueError, IOError):
         return default
 
 
 def save_json(file_path: Path, data: dict) -> None:
+    """Write atomically: a crash mid-save can never leave a truncated file."""
     file_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    tmp_path = file_path.with_suffix(file_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_dumps(data))
+    os.replace(tmp_path, file_path)
 
 
 def find_session_cache_dir(session_id: str = "") -> Path | None:
@@ -78,66 +101,60 @@ def read_edited_files(cache_dir: Path):
     Legacy: 2026-02-01T17:10:16+00:00:path/to/file.ts
     """
     edited_files_log = cache_dir / "edited-files.log"
-    if not edited_files_log.exists():
-        return set()
 
     files = set()
     try:
-        with open(edited_files_log, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
+        with open(edited_files_log, "rb") as f:
+            # mmap raises ValueError for empty files
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return files
 
-                # Try JSON Lines format first (new format)
-                if line.startswith("{"):
-                    try:
-                        entry = json.loads(line)
-                        filepath = entry.get("file", "")
-                        if filepath:
-                            files.add(filepath)
-                        continue
-                    except json.JSONDecodeError:
-                        pass
-
-                # Fallback to legacy format: timestamp:filepath
-                if ":" in line:
-                    # Handle ISO timestamp with colons
-                    # Format: 2026-02-01T17:10:16.552583+00:00:filepath
-                    idx = line.rfind("+00:00:")
-                    if idx != -1:
-                        filepath = line[idx + 7 :]
-                    else:
-                        # Fallback: split on first colon after date
-                        idx = line.find(":", 25)
-                        if idx != -1:
-                            filepath = line[idx + 1 :]
-                        else:
-                            continue
+    try:
+        size = mm.size()
+        pos = 0
+        while pos < size:
+            # bytes.find/rfind run at memchr/memmem speed on the mapped pages
+            nl = mm.find(b"\n", pos)
+            if nl == -1:
+                line, pos = mm[pos:size], size
+            else:
+                line, pos = mm[pos:nl], nl + 1
+            if not line:
+                continue
+
+            # Try JSON Lines format first (new format)
+            if line[:1] == b"{":
+                try:
+                    entry = _loads(line)
+                    filepath = entry.get("file", "")
                     if filepath:
                         files.add(filepath)
-    except IOError:
-        pass
+                    continue
+                except ValueError:
+                    pass
+
+            # Fallback to legacy format: timestamp:filepath
+            # Handle ISO timestamp with colons
+            # Format: 2026-02-01T17:10:16.552583+00:00:filepath
+            idx = line.rfind(b"+00:00:")
+            if idx != -1:
+                raw_path = line[idx + 7 :]
+            else:
+                # Fallback: split on first colon after date
+                idx = line.find(b":", 25)
+                if idx != -1:
+                    raw_path = line[idx + 1 :]
+                else:
+                    continue
+            if raw_path:
+                files.add(raw_path.rstrip(b"\r").decode("utf-8"))
+    finally:
+        mm.close()
 
     return files
 
 
-def normalize_pair(file1: str, file2: str):
-    """Normalize pair to consistent order (alphabetical)."""
-    return tuple(sorted([file1, file2]))
-
-
-def find_existing_pair(pairs: list, file1: str, file2: str):
-    """Find existing pair in storage (order-independent)."""
-    normalized = normalize_pair(file1, file2)
-    for pair in pairs:
-        pair_files = pair.get("files", [])
-        if len(pair_files) >= 2:
-            if normalize_pair(pair_files[0], pair_files[1]) == normalized:
-                return pair
-    return None
-
-
 def track_co_modifications(session_id: str = "") -> dict:
     """Track co-modifications from current session.
 
@@ -157,58 +174,108 @@ def track_co_modifications(session_id: str = "") -> dict:
     if len(session_files) < 2:
         return stats
 
-    # Load existing co-modifications
+    # Load existing co-modifications. Pairs live in a dict keyed by the
+    # NUL-joined sorted file pair, so lookup and increment are O(1).
     comods_data = load_json(
         COMODS_FILE,
-        {"version": "1.0", "max_entries": MAX_ENTRIES, "min_frequency": 2, "pairs": []},
+        {"version": "1.1", "max_entries": MAX_ENTRIES, "min_frequency": 2, "pairs": {}},
     )
 
-    pairs = comods_data.get("pairs", [])
-    now = datetime.now(timezone.utc).isoformat()
+    pairs = comods_data.get("pairs", {})
+    if isinstance(pairs, list):
+        pairs = convert_legacy_pairs(pairs)
 
-    # Generate all pairs from session files
-    session_pairs = list(combinations(sorted(session_files), 2))
+    now = datetime.now(timezone.utc).isoformat()
 
-    for file1, file2 in session_pairs:
-        existing = find_existing_pair(pairs, file1, file2)
+    # With a full store, a brand-new pair (frequency 1, last_seen=now) ties
+    # stored frequency-1 pairs and outranks them on last_seen, so it only
+    # loses the eviction sort when every stored pair sits at frequency >= 2
+    if len(pairs) >= MAX_ENTRIES:
+        min_frequency = min(info["frequency"] for info in pairs.values())
+    else:
+        min_frequency = 0
+
+    # combinations over a sorted iterable already yields normalized pairs
+    for file1, file2 in combinations(sorted(session_files), 2):
+        existing = pairs.get(file1 + "\0" + file2)
         if existing:
-            existing["frequency"] = existing.get("frequency", 1) + 1
+            existing["frequency"] += 1
             existing["last_seen"] = now
             stats["pairs_updated"] += 1
+        elif min_frequency >= 2:
+            continue
         else:
-            pairs.append(
-                {
-                    "files": list(normalize_pair(file1, file2)),
-                    "frequency": 1,
-                    "last_seen": now,
-                }
-            )
+            pairs[file1 + "\0" + file2] = {"frequency": 1, "last_seen": now}
             stats["pairs_added"] += 1
 
-    # FIFO rotation with frequency priority
+    # Rotation with frequency priority, only when actually evicting
     # Sort by frequency DESC, then last_seen DESC
-    pairs.sort(
-        key=lambda p: (p.get("frequency", 0), p.get("last_seen", "")), reverse=True
-    )
-
-    # Keep only MAX_ENTRIES
-    pairs = pairs[:MAX_ENTRIES]
-
+    if len(pairs) > MAX_ENTRIES:
+        survivors = sorted(
+            pairs.items(),
+            key=lambda item: _PAIR_SORT_KEY(item[1]),
+            reverse=True,
+        )[:MAX_ENTRIES]
+        pairs = dict(survivors)
+
+    comods_data["version"] = "1.1"
     comods_data["pairs"] = pairs
     save_json(COMODS_FILE, comods_data)
+    update_index_comods(pairs_as_list(pairs))
 
     return stats
 
 
+def convert_legacy_pairs(pair_list: list) -> dict:
+    """Convert the pre-1.1 list-of-objects layout to the keyed dict."""
+    pairs = {}
+    for p in pair_list:
+        pair_files = p.get("files", [])
+        if len(pair_files) >= 2:
+            a, b = sorted(pair_files[:2])
+            pairs[a + "\0" + b] = {
+                "frequency": p.get("frequency", 1),
+                "last_seen": p.get("last_seen", ""),
+            }
+    return pairs
+
+
+def pairs_as_list(pairs: dict) -> list:
+    """Expand the keyed dict into the files/frequency/last_seen list view
+    used by index.json and memory.json consumers."""
+    return [
+        {"files": key.split("\0"), **info} for key, info in pairs.items()
+    ]
+
+
+def update_index_comods(pairs: list) -> None:
+    """Merge the comods aggregate into index.json so the loader's summary
+    and top-10 listing never need to open co-modifications.json."""
+    high_freq = [p for p in pairs if p.get("frequency", 0) >= 2]
+    high_freq.sort(key=_PAIR_SORT_KEY, reverse=True)
+
+    index_data = load_json(INDEX_FILE, {})
+    index_data.setdefault("summary", {})["comods"] = {
+        "high_freq_count": len(high_freq),
+        "top": high_freq[:10],
+    }
+    save_json(INDEX_FILE, index_data)
+
+    consolidated = load_json(MEMORY_FILE, {})
+    consolidated["comods"] = pairs
+    save_json(MEMORY_FILE, consolidated)
+
+
 def main():
     """Main entry point for Stop hook."""
     try:
         # Read session_id from Stop event payload
         session_id = ""
         try:
-            data = json.loads(sys.stdin.read())
-            session_id = data.get("session_id", "")
-        except (json.JSONDecodeError, IOError):
+            raw = sys.stdin.buffer.read()
+            if raw:
+                session_id = _loads(raw).get("session_id", "")
+        except (ValueError, IOError):
             pass
 
         stats = track_co_modifications(session_id)
@@ -14,7 +14,13 @@ Triggers documentation suggestions when:
 import json
 import sys
 import os
-from pathlib import Path
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 # Documentation-relevant path patterns
 DOC_TRIGGERS = {
@@ -55,66 +61,57 @@ DOC_TRIGGERS = {
     },
 }
 
-# Cooldown tracking (prevent spam)
-COOLDOWN_FILE = os.path.join(
-    os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()),
-    ".claude",
-    "state",
-    "doc-reminder-cooldown.json",
-)
-COOLDOWN_SECONDS = 300  # 5 minutes between reminders
+# Compiled matchers: one regex pass over the path, set lookup for names.
+# Built lazily so the frequent early-exit path (non-Edit/Write tools) never
+# pays for the re import and pattern compiles.
+PATH_MATCHERS: dict = {}
+FILE_NAME_SETS: dict = {}
 
 
-def load_cooldown() -> dict:
-    """Load cooldown state."""
-    try:
-        if os.path.exists(COOLDOWN_FILE):
-            with open(COOLDOWN_FILE, "r") as f:
-                return json.load(f)
-    except Exception:
-        pass
-    return {}
+def build_matchers() -> None:
+    import re
 
+    for skill, cfg in DOC_TRIGGERS.items():
+        if cfg.get("path_patterns"):
+            PATH_MATCHERS[skill] = re.compile(
+                "|".join(re.escape(p) for p in cfg["path_patterns"])
+            )
+        if cfg.get("file_names"):
+            FILE_NAME_SETS[skill] = frozenset(cfg["file_names"])
 
-def save_cooldown(state: dict) -> None:
-    """Save cooldown state."""
-    try:
-        with open(COOLDOWN_FILE, "w") as f:
-            json.dump(state, f)
-    except Exception:
-        pass
+# Cooldown tracking (prevent spam): one mtime-based stamp file per skill,
+# so a cooldown check is a single stat instead of a JSON load/save round-trip.
+STATE_DIR = os.path.join(
+    os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()), ".claude", "state"
+)
+COOLDOWN_SECONDS = 300  # 5 minutes between reminders
+
+
+def cooldown_stamp(skill: str) -> str:
+    return os.path.join(STATE_DIR, f"doc-reminder-{skill}.stamp")
 
 
 def check_cooldown(skill: str) -> bool:
     """Check if skill reminder is on cooldown."""
     import time
 
-    state = load_cooldown()
-    last_shown = state.get(skill, 0)
+    try:
+        last_shown = os.stat(cooldown_stamp(skill)).st_mtime
+    except OSError:
+        return False
     return (time.time() - last_shown) < COOLDOWN_SECONDS
 
 
 def update_cooldown(skill: str) -> None:
     """Update cooldown timestamp for skill."""
-    import time
-
-    state = load_cooldown()
-    state[skill] = time.time()
-    save_cooldown(state)
-
-
-def match_path(file_path: str, patterns: list) -> bool:
-    """Check if file path matches any pattern."""
-    for pattern in patterns:
-        if pattern in file_path:
-            return True
-    return False
-
-
-def match_file_name(file_path: str, names: list) -> bool:
-    """Check if file name matches any in list."""
-    file_name = Path(file_path).name
-    return file_name in names
+    try:
+        stamp = cooldown_stamp(skill)
+        os.makedirs(STATE_DIR, exist_ok=True)
+        with open(stamp, "a"):
+            pass
+        os.utime(stamp)
+    except OSError:
+        pass
 
 
 def analyze_edit(tool_input: dict, tool_result: dict) -> list:
@@ -125,6 +122,9 @@ def analyze_edit(tool_input: dict, tool_result: dict) -> list:
     if not file_path:
         return suggestions
 
+    if not PATH_MATCHERS:
+        build_matchers()
+
     for skill, config in DOC_TRIGGERS.items():
         # Skip if on cooldown
         if check_cooldown(skill):
@@ -132,14 +132,12 @@ def analyze_edit(tool_input: dict, tool_result: dict) -> list:
 
         matched = False
 
-        # Check path patterns
-        if "path_patterns" in config:
-            if match_path(file_path, config["path_patterns"]):
-                matched = True
+        path_matcher = PATH_MATCHERS.get(skill)
+        if path_matcher and path_matcher.search(file_path):
+            matched = True
 
-        # Check file names
-        if not matched and "file_names" in config:
-            if match_file_name(file_path, config["file_names"]):
+        if not matched and skill in FILE_NAME_SETS:
+            if os.path.basename(file_path) in FILE_NAME_SETS[skill]:
                 matched = True
 
         if matched:
@@ -181,14 +179,12 @@ def main():
     """Main hook entry point."""
     try:
         # Read hook input from stdin
-        input_data = ""
-        for line in sys.stdin:
-            input_data += line
+        input_data = sys.stdin.buffer.read()
 
         if not input_data.strip():
             sys.exit(0)
 
-        data = json.loads(input_data)
+        data = _loads(input_data)
 
         # Only process Edit and Write tools
         tool_name = data.get("tool_name", "")
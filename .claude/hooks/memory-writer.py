@@ -5,96 +5,195 @@ Memory Writer Hook - Persists session learnings to permanent memory.
 Runs on Stop event. Reads session learnings file and appends to permanent
 learnings.json with FIFO rotation (max 100 entries).
 
-Session learnings file (.claude/state/session-learnings.json) is populated
-by Claude during the session when /remember command is used.
+Session storage (.claude/state/session-*.jsonl plus session-preferences.json)
+is populated by remember-handler.py when the /remember command is used; the
+legacy single-file session-learnings.json layout is still read if present.
 """
 
 import json
 import os
 import sys
+from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
 CLAUDE_PROJECT_DIR = os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())
 MEMORY_DIR = Path(CLAUDE_PROJECT_DIR) / ".claude" / "memory"
 STATE_DIR = Path(CLAUDE_PROJECT_DIR) / ".claude" / "state"
 
 SESSION_LEARNINGS_FILE = STATE_DIR / "session-learnings.json"
+SESSION_LEARNINGS_JSONL = STATE_DIR / "session-learnings.jsonl"
+SESSION_DECISIONS_JSONL = STATE_DIR / "session-decisions.jsonl"
+SESSION_PREFERENCES_FILE = STATE_DIR / "session-preferences.json"
+SESSION_CONTEXT_FILE = STATE_DIR / "session-context.json"
 LEARNINGS_FILE = MEMORY_DIR / "learnings.json"
 DECISIONS_FILE = MEMORY_DIR / "decisions.json"
 PREFERENCES_FILE = MEMORY_DIR / "preferences.json"
 INDEX_FILE = MEMORY_DIR / "index.json"
+MEMORY_FILE = MEMORY_DIR / "memory.json"
 
 MAX_LEARNINGS = 100
 MAX_DECISIONS = 50
 
+_MKDIR_DONE: set[Path] = set()
+
+
+def _ensure_dir(path: Path) -> None:
+    """mkdir -p, but at most once per directory per process."""
+    if path not in _MKDIR_DONE:
+        path.mkdir(parents=True, exist_ok=True)
+        _MKDIR_DONE.add(path)
+
 
 def load_json(file_path: Path, default: dict) -> dict:
     """Load JSON file or return default if not exists/invalid."""
-    if not file_path.exists():
+    try:
+        blob = file_path.read_bytes()
+    except OSError:
+        return default
+    if not blob:
         return default
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
+        return _loads(blob)
+    except ValueError:
         return default
 
 
 def save_json(file_path: Path, data: dict) -> None:
-    """Save data to JSON file with pretty formatting."""
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    """Save data to JSON file atomically (temp file + rename)."""
+    _ensure_dir(file_path.parent)
+    tmp_path = file_path.with_suffix(file_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_dumps(data))
+    os.replace(tmp_path, file_path)
+
+
+def read_jsonl(file_path: Path) -> list[dict]:
+    """Read a JSON Lines file, skipping blank or malformed lines."""
+    try:
+        blob = file_path.read_bytes()
+    except OSError:
+        return []
+
+    records = []
+    for line in blob.splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(_loads(line))
+        except ValueError:
+            continue
+    return records
+
+
+def load_session_data() -> dict:
+    """Assemble this session's pending memory from the JSONL append files,
+    merged over the legacy single-JSON layout when that still exists."""
+    legacy = load_json(SESSION_LEARNINGS_FILE, {})
+
+    learnings = list(legacy.get("learnings", [])) + read_jsonl(SESSION_LEARNINGS_JSONL)
+    decisions = list(legacy.get("decisions", [])) + read_jsonl(SESSION_DECISIONS_JSONL)
+    preferences = dict(legacy.get("preferences", {}))
+    preferences.update(load_json(SESSION_PREFERENCES_FILE, {}))
+
+    if not (learnings or decisions or preferences):
+        return {}
+
+    session_id = legacy.get("session_id") or load_json(SESSION_CONTEXT_FILE, {}).get(
+        "session_id", "unknown"
+    )
+
+    return {
+        "session_id": session_id,
+        "learnings": learnings,
+        "decisions": decisions,
+        "preferences": preferences,
+    }
+
 
+def clear_session_data() -> None:
+    for session_file in (
+        SESSION_LEARNINGS_FILE,
+        SESSION_LEARNINGS_JSONL,
+        SESSION_DECISIONS_JSONL,
+        SESSION_PREFERENCES_FILE,
+    ):
+        try:
+            session_file.unlink()
+        except OSError:
+            pass
 
-def rotate_entries(entries: list, max_count: int) -> list:
-    """FIFO rotation - keep only the most recent entries."""
-    if len(entries) > max_count:
-        return entries[-max_count:]
-    return entries
 
+def flush_saves(pending: list[tuple[Path, dict]]) -> None:
+    """Commit all dirty JSON files in one final write phase."""
+    for file_path, data in pending:
+        save_json(file_path, data)
 
-def append_to_daily_log(session_id: str, entries: list[dict], entry_type: str) -> None:
-    """Append entries to today's episodic log file."""
-    if not entries:
+
+def append_to_daily_log(
+    session_id: str, sections: list[tuple[list[dict], str]], now: datetime
+) -> None:
+    """Append this session's sections to today's episodic log in one write."""
+    sections = [(entries, entry_type) for entries, entry_type in sections if entries]
+    if not sections:
         return
 
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    today = now.strftime("%Y-%m-%d")
     log_file = MEMORY_DIR / f"{today}.md"
-    timestamp = datetime.now(timezone.utc).strftime("%H:%M")
-
-    body_lines = [f"\n### {session_id} ({timestamp}) - {entry_type}"]
-    for entry in entries:
-        if entry_type == "learnings":
-            category = entry.get("category", "general")
-            lesson = entry.get("lesson", "")
-            body_lines.append(f"- [{category}] {lesson}")
-        elif entry_type == "decisions":
-            decision = entry.get("decision", "")
-            rationale = entry.get("rationale", "")
-            line = f"- **Decision:** {decision}"
-            if rationale:
-                line += f" -- *{rationale}*"
-            body_lines.append(line)
-    body_lines.append("")
-
-    log_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(log_file, "a", encoding="utf-8") as f:
-        if f.tell() == 0:
-            f.write(f"# Memory Log {today}\n")
-        f.write("\n".join(body_lines) + "\n")
+    timestamp = now.strftime("%H:%M")
+
+    body_lines = []
+    for entries, entry_type in sections:
+        body_lines.append(f"\n### {session_id} ({timestamp}) - {entry_type}")
+        for entry in entries:
+            if entry_type == "learnings":
+                category = entry.get("category", "general")
+                lesson = entry.get("lesson", "")
+                body_lines.append(f"- [{category}] {lesson}")
+            elif entry_type == "decisions":
+                decision = entry.get("decision", "")
+                rationale = entry.get("rationale", "")
+                line = f"- **Decision:** {decision}"
+                if rationale:
+                    line += f" -- *{rationale}*"
+                body_lines.append(line)
+        body_lines.append("")
+
+    payload = ("\n".join(body_lines) + "\n").encode("utf-8")
+
+    _ensure_dir(log_file.parent)
+    with open(log_file, "ab") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            payload = f"# Memory Log {today}\n".encode("utf-8") + payload
+        f.write(payload)
 
 
 def process_session_learnings() -> dict:
     """Process session learnings and persist to permanent memory."""
     stats = {"learnings_added": 0, "decisions_added": 0, "preferences_updated": 0}
+    daily_sections: list[tuple[list[dict], str]] = []
+    pending_saves: list[tuple[Path, dict]] = []
 
-    # Check if session learnings exist
-    if not SESSION_LEARNINGS_FILE.exists():
+    session_data = load_session_data()
+    if not session_data:
         return stats
-
-    session_data = load_json(SESSION_LEARNINGS_FILE, {})
     session_id = session_data.get("session_id", "unknown")
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
 
     # Process learnings
     if "learnings" in session_data and session_data["learnings"]:
@@ -108,25 +207,29 @@ def process_session_learnings() -> dict:
             },
         )
 
+        # A bounded deque does the FIFO rotation in O(1) per append
+        entries = deque(learnings_data["entries"], maxlen=MAX_LEARNINGS)
         for learning in session_data["learnings"]:
-            entry = {
-                "lesson": learning.get("lesson", ""),
-                "context": learning.get("context", ""),
-                "category": learning.get("category", "general"),
-                "timestamp": learning.get(
-                    "timestamp", datetime.now(timezone.utc).isoformat()
-                ),
-                "session_id": session_id,
-            }
-            learnings_data["entries"].append(entry)
+            lesson = learning.get("lesson", "")
+            entries.append(
+                {
+                    "lesson": lesson,
+                    "context": learning.get("context", ""),
+                    "category": learning.get("category", "general"),
+                    "timestamp": learning.get("timestamp") or now_iso,
+                    "session_id": session_id,
+                    # Headline widths used by the loader's layers, cut once
+                    # at write time instead of per read
+                    "_h50": _headline(lesson, 50),
+                    "_h60": _headline(lesson, 60),
+                    "_h80": _headline(lesson, 80),
+                }
+            )
             stats["learnings_added"] += 1
 
-        # FIFO rotation
-        learnings_data["entries"] = rotate_entries(
-            learnings_data["entries"], MAX_LEARNINGS
-        )
-        save_json(LEARNINGS_FILE, learnings_data)
-        append_to_daily_log(session_id, session_data["learnings"], "learnings")
+        learnings_data["entries"] = list(entries)
+        pending_saves.append((LEARNINGS_FILE, learnings_data))
+        daily_sections.append((session_data["learnings"], "learnings"))
 
     # Process decisions
     if "decisions" in session_data and session_data["decisions"]:
@@ -140,25 +243,25 @@ def process_session_learnings() -> dict:
             },
         )
 
+        decisions = deque(decisions_data["decisions"], maxlen=MAX_DECISIONS)
         for decision in session_data["decisions"]:
-            entry = {
-                "decision": decision.get("decision", ""),
-                "rationale": decision.get("rationale", ""),
-                "alternatives": decision.get("alternatives", []),
-                "timestamp": decision.get(
-                    "timestamp", datetime.now(timezone.utc).isoformat()
-                ),
-                "session_id": session_id,
-            }
-            decisions_data["decisions"].append(entry)
+            decision_text = decision.get("decision", "")
+            decisions.append(
+                {
+                    "decision": decision_text,
+                    "rationale": decision.get("rationale", ""),
+                    "alternatives": decision.get("alternatives", []),
+                    "timestamp": decision.get("timestamp") or now_iso,
+                    "session_id": session_id,
+                    "_h60": _headline(decision_text, 60),
+                    "_h80": _headline(decision_text, 80),
+                }
+            )
             stats["decisions_added"] += 1
 
-        # FIFO rotation
-        decisions_data["decisions"] = rotate_entries(
-            decisions_data["decisions"], MAX_DECISIONS
-        )
-        save_json(DECISIONS_FILE, decisions_data)
-        append_to_daily_log(session_id, session_data["decisions"], "decisions")
+        decisions_data["decisions"] = list(decisions)
+        pending_saves.append((DECISIONS_FILE, decisions_data))
+        daily_sections.append((session_data["decisions"], "decisions"))
 
     # Process preferences (key-based overwrite, not append)
     if "preferences" in session_data and session_data["preferences"]:
@@ -172,23 +275,29 @@ def process_session_learnings() -> dict:
         )
 
         for key, value in session_data["preferences"].items():
-            preferences_data["preferences"][key] = value
-            stats["preferences_updated"] += 1
+            if preferences_data["preferences"].get(key) != value:
+                preferences_data["preferences"][key] = value
+                stats["preferences_updated"] += 1
 
-        save_json(PREFERENCES_FILE, preferences_data)
+        if stats["preferences_updated"]:
+            pending_saves.append((PREFERENCES_FILE, preferences_data))
 
-    # Clear session learnings after processing
-    try:
-        SESSION_LEARNINGS_FILE.unlink()
-    except OSError:
-        pass
+    flush_saves(pending_saves)
+    append_to_daily_log(session_id, daily_sections, now)
+
+    # Clear session storage after processing
+    clear_session_data()
 
     return stats
 
 
+def _headline(text: str, width: int = 80) -> str:
+    return text[:width] + "..." if len(text) > width else text
+
+
 def update_index() -> None:
     """Update index.json with current memory summary."""
-    from collections import defaultdict
+    from collections import Counter
 
     learnings_data = load_json(LEARNINGS_FILE, {"entries": []})
     decisions_data = load_json(DECISIONS_FILE, {"decisions": []})
@@ -196,22 +305,65 @@ def update_index() -> None:
     entries = learnings_data.get("entries", [])
     decisions = decisions_data.get("decisions", [])
 
-    by_category = defaultdict(int)
-    for entry in entries:
-        cat = entry.get("category", "general")
-        by_category[cat] += 1
+    by_category = Counter(e.get("category", "general") for e in entries)
+
+    by_category_ids: dict[str, list[int]] = {}
+    for idx, entry in enumerate(entries):
+        by_category_ids.setdefault(entry.get("category", "general"), []).append(idx)
+
+    # Pre-truncated headlines: the loader's summary preview and headline
+    # layer render from the index without opening the full files
+    recent_headlines = [
+        [
+            entry.get("category", "general"),
+            entry.get("_h50") or _headline(entry.get("lesson", ""), 50),
+        ]
+        for entry in entries[-3:]
+    ]
+    headlines = {
+        "learnings": [
+            [
+                entry.get("category", "general"),
+                entry.get("_h80") or _headline(entry.get("lesson", "")),
+            ]
+            for entry in entries
+        ],
+        "decisions": [
+            entry.get("_h80") or _headline(entry.get("decision", ""))
+            for entry in decisions
+        ],
+    }
+
+    # The co-modification tracker owns summary.comods; carry it over so the
+    # two Stop hooks don't clobber each other's index contributions
+    comods_summary = load_json(INDEX_FILE, {}).get("summary", {}).get("comods")
 
     index_data = {
         "version": "1.0",
         "updated_at": datetime.now(timezone.utc).isoformat(),
         "summary": {
-            "learnings": {"total": len(entries), "by_category": dict(by_category)},
+            "learnings": {
+                "total": len(entries),
+                "by_category": dict(by_category),
+                "recent_headlines": recent_headlines,
+            },
             "decisions": {"total": len(decisions)},
         },
+        "headlines": headlines,
+        "by_category_ids": by_category_ids,
     }
+    if comods_summary is not None:
+        index_data["summary"]["comods"] = comods_summary
 
     save_json(INDEX_FILE, index_data)
 
+    # Consolidated single-read file for the loader; the comod tracker owns
+    # the comods key, so merge rather than rewrite
+    consolidated = load_json(MEMORY_FILE, {})
+    consolidated["learnings"] = entries
+    consolidated["decisions"] = decisions
+    save_json(MEMORY_FILE, consolidated)
+
 
 def main():
     """Main entry point for Stop hook."""
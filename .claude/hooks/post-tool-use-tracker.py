@@ -20,6 +20,21 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
 # Customize for your project's monorepo structure.
 # Each entry maps a directory pattern to its TypeScript check command.
 REPO_MAPPINGS = [
@@ -40,39 +55,50 @@ REPO_MAPPINGS = [
     },
 ]
 
+# Every pattern is an anchored literal prefix, so plain str.startswith
+# replaces the regex engine entirely.
+_PREFIX_MAP = tuple((m["pattern"].lstrip("^"), m) for m in REPO_MAPPINGS)
+
+_TS_FILE_RE = re.compile(r"\.(ts|tsx)$")
+
+PROJECT_ROOT = Path(os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()))
+_PROJECT_ROOT_PREFIX = str(PROJECT_ROOT) + os.sep
+
 
 def get_project_root() -> Path:
-    return Path(os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()))
+    return PROJECT_ROOT
 
 
 def get_cache_dir(session_id: str) -> Path:
     return get_project_root() / ".claude" / "tsc-cache" / session_id
 
 
+_MKDIR_DONE: set[Path] = set()
+
+
 def ensure_cache_dir(session_id: str) -> Path:
     cache_dir = get_cache_dir(session_id)
-    cache_dir.mkdir(parents=True, exist_ok=True)
+    if cache_dir not in _MKDIR_DONE:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _MKDIR_DONE.add(cache_dir)
     return cache_dir
 
 
 def get_relative_path(absolute_path: str) -> str:
-    project_root = str(get_project_root())
-    if absolute_path.startswith(project_root):
-        return absolute_path[len(project_root) + 1 :]
+    if absolute_path.startswith(_PROJECT_ROOT_PREFIX):
+        return absolute_path[len(_PROJECT_ROOT_PREFIX) :]
     return absolute_path
 
 
 def find_repo(relative_path: str) -> dict | None:
-    for mapping in REPO_MAPPINGS:
-        if re.match(mapping["pattern"], relative_path):
+    for prefix, mapping in _PREFIX_MAP:
+        if relative_path.startswith(prefix):
             return mapping
     return None
 
 
 def is_typescript_file(file_path: str) -> bool:
-    return (
-        bool(re.search(r"\.(ts|tsx)$", file_path)) and "node_modules" not in file_path
-    )
+    return bool(_TS_FILE_RE.search(file_path)) and "node_modules" not in file_path
 
 
 def append_to_file(file_path: Path, content: str) -> None:
@@ -80,6 +106,11 @@ def append_to_file(file_path: Path, content: str) -> None:
         f.write(content + "\n")
 
 
+def append_jsonl(file_path: Path, records: list[dict]) -> None:
+    with open(file_path, "ab") as f:
+        f.write(b"".join(_dumps(record) + b"\n" for record in records))
+
+
 def read_lines(file_path: Path) -> list[str]:
     if not file_path.exists():
         return []
@@ -87,28 +118,55 @@ def read_lines(file_path: Path) -> list[str]:
         return [line.strip() for line in f if line.strip()]
 
 
-def track_file(session_id: str, file_path: str) -> None:
-    cache_dir = ensure_cache_dir(session_id)
-    relative_path = get_relative_path(file_path)
+# affected-repos.txt content per session, read once per process so repeated
+# track_file calls in one invocation don't re-parse the file
+_seen_repos: dict[str, set[str]] = {}
+
 
-    if not is_typescript_file(relative_path):
+def get_session_repos(session_id: str, affected_repos_file: Path) -> set[str]:
+    repos = _seen_repos.get(session_id)
+    if repos is None:
+        repos = set(read_lines(affected_repos_file))
+        _seen_repos[session_id] = repos
+    return repos
+
+
+def track_files(session_id: str, file_paths: list[str]) -> None:
+    relative_paths = [
+        rel
+        for rel in map(get_relative_path, file_paths)
+        if is_typescript_file(rel)
+    ]
+    if not relative_paths:
         return
 
+    cache_dir = ensure_cache_dir(session_id)
     timestamp = datetime.now(timezone.utc).isoformat()
     edited_files_log = cache_dir / "edited-files.log"
     affected_repos_file = cache_dir / "affected-repos.txt"
     commands_file = cache_dir / "commands.txt"
 
-    # JSON Lines format for robust parsing
-    entry = json.dumps({"ts": timestamp, "file": relative_path})
-    append_to_file(edited_files_log, entry)
+    # JSON Lines format for robust parsing; whole batch in one append
+    append_jsonl(
+        edited_files_log,
+        [{"ts": timestamp, "file": rel} for rel in relative_paths],
+    )
+
+    session_repos = get_session_repos(session_id, affected_repos_file)
+    new_mappings = []
+    for rel in relative_paths:
+        repo_mapping = find_repo(rel)
+        if repo_mapping and repo_mapping["repo"] not in session_repos:
+            session_repos.add(repo_mapping["repo"])
+            new_mappings.append(repo_mapping)
 
-    repo_mapping = find_repo(relative_path)
-    if repo_mapping:
-        existing_repos = read_lines(affected_repos_file)
-        if repo_mapping["repo"] not in existing_repos:
-            append_to_file(affected_repos_file, repo_mapping["repo"])
-            append_to_file(commands_file, repo_mapping["tsc_command"])
+    if new_mappings:
+        append_to_file(
+            affected_repos_file, "\n".join(m["repo"] for m in new_mappings)
+        )
+        append_to_file(
+            commands_file, "\n".join(m["tsc_command"] for m in new_mappings)
+        )
 
 
 def main() -> None:
@@ -121,20 +179,22 @@ def main() -> None:
         sys.exit(0)
 
     try:
-        data = json.loads(input_data)
-    except json.JSONDecodeError:
+        data = _loads(input_data)
+    except ValueError:
         sys.exit(0)
 
     session_id = data.get("session_id", "default")
     tool_input = data.get("tool_input", {})
 
+    file_paths = []
     if tool_input.get("file_path"):
-        track_file(session_id, tool_input["file_path"])
+        file_paths.append(tool_input["file_path"])
+    for file_info in tool_input.get("files") or []:
+        if file_info.get("file_path"):
+            file_paths.append(file_info["file_path"])
 
-    if tool_input.get("files"):
-        for file_info in tool_input["files"]:
-            if file_info.get("file_path"):
-                track_file(session_id, file_info["file_path"])
+    if file_paths:
+        track_files(session_id, file_paths)
 
     sys.exit(0)
 
@@ -13,38 +13,47 @@ import re
 import sys
 
 
+# Each entry pairs the regex with a required lowercase literal; the literal
+# acts as a cheap substring prefilter so the regex engine only runs on
+# commands that could possibly match.
 DANGEROUS_BASH_PATTERNS = [
-    r"rm\s+-rf\s+/",
-    r"rm\s+-rf\s+\*",
-    r"rm\s+-rf\s+~",
-    r"rm\s+-rf\s+\$HOME",
-    r"rm\s+-rf\s+\$\{HOME\}",
-    r"rm\s+--no-preserve-root",
-    r"dd\s+.*of=/dev/",
-    r"mkfs\.",
-    r":\(\)\s*\{\s*:\|:&\s*\};:",
-    r">\s*/dev/sd[a-z]",
-    r"chmod\s+-R\s+777\s+/",
-    r"chown\s+-R\s+.*\s+/",
-    r"DROP\s+DATABASE",
-    r"DROP\s+TABLE",
-    r"TRUNCATE\s+TABLE",
-    r"DELETE\s+FROM\s+\w+\s*;?\s*$",
-    r"docker\s+system\s+prune\s+-a?f",
-    r"docker\s+volume\s+prune\s+-f",
-    r"kubectl\s+delete\s+namespace",
-    r"kubectl\s+delete\s+--all",
-    r"helm\s+uninstall\s+--all",
-    r"git\s+push\s+.*--force.*main",
-    r"git\s+push\s+.*--force.*master",
-    r"git\s+reset\s+--hard\s+HEAD~",
-    r"rm\s+-rf\s+\.\s*$",
-    r"rm\s+-rf\s+\./",
-    r"curl\s+.*\|\s*(?:ba)?sh",
-    r"wget\s+.*\|\s*(?:ba)?sh",
-    r"git\s+clean\s+-[a-z]*f",
+    (r"rm\s+-rf\s+/", "rm"),
+    (r"rm\s+-rf\s+\*", "rm"),
+    (r"rm\s+-rf\s+~", "rm"),
+    (r"rm\s+-rf\s+\$HOME", "rm"),
+    (r"rm\s+-rf\s+\$\{HOME\}", "rm"),
+    (r"rm\s+--no-preserve-root", "rm"),
+    (r"dd\s+.*of=/dev/", "of=/dev/"),
+    (r"mkfs\.", "mkfs"),
+    (r":\(\)\s*\{\s*:\|:&\s*\};:", ":()"),
+    (r">\s*/dev/sd[a-z]", "/dev/sd"),
+    (r"chmod\s+-R\s+777\s+/", "chmod"),
+    (r"chown\s+-R\s+.*\s+/", "chown"),
+    (r"DROP\s+DATABASE", "drop"),
+    (r"DROP\s+TABLE", "drop"),
+    (r"TRUNCATE\s+TABLE", "truncate"),
+    (r"DELETE\s+FROM\s+\w+\s*;?\s*$", "delete"),
+    (r"docker\s+system\s+prune\s+-a?f", "docker"),
+    (r"docker\s+volume\s+prune\s+-f", "docker"),
+    (r"kubectl\s+delete\s+namespace", "kubectl"),
+    (r"kubectl\s+delete\s+--all", "kubectl"),
+    (r"helm\s+uninstall\s+--all", "helm"),
+    (r"git\s+push\s+.*--force.*main", "git"),
+    (r"git\s+push\s+.*--force.*master", "git"),
+    (r"git\s+reset\s+--hard\s+HEAD~", "git"),
+    (r"rm\s+-rf\s+\.\s*$", "rm"),
+    (r"rm\s+-rf\s+\./", "rm"),
+    (r"curl\s+.*\|\s*(?:ba)?sh", "curl"),
+    (r"wget\s+.*\|\s*(?:ba)?sh", "wget"),
+    (r"git\s+clean\s+-[a-z]*f", "git"),
 ]
 
+_DANGEROUS_BASH = [
+    (re.compile(pattern, re.IGNORECASE), literal)
+    for pattern, literal in DANGEROUS_BASH_PATTERNS
+]
+
+
 PROTECTED_FILE_PATTERNS = [
     r"\.env$",
     r"\.env\.(?!example)",  # Allow .env.example but block .env.local, .env.production, etc.
@@ -72,27 +81,33 @@ PROTECTED_PATHS = [
     "~/.kube/",
 ]
 
+# Collapse both protected lists into one compiled alternation each, so a
+# lookup is a single scan of the path instead of a loop of regex entries
+_PROTECTED_FILE_RE = re.compile("|".join(PROTECTED_FILE_PATTERNS), re.IGNORECASE)
+_PROTECTED_PATH_RE = re.compile("|".join(map(re.escape, PROTECTED_PATHS)))
+
 
 def is_dangerous_bash_command(command: str) -> tuple[bool, str]:
     """Check if bash command matches dangerous patterns."""
     command_lower = command.lower()
 
-    for pattern in DANGEROUS_BASH_PATTERNS:
-        if re.search(pattern, command, re.IGNORECASE):
-            return True, f"Blocked dangerous command pattern: {pattern}"
+    for regex, literal in _DANGEROUS_BASH:
+        if literal not in command_lower:
+            continue
+        if regex.search(command):
+            return True, f"Blocked dangerous command pattern: {regex.pattern}"
 
     return False, ""
 
 
 def is_protected_file(file_path: str) -> tuple[bool, str]:
     """Check if file path matches protected patterns."""
-    for pattern in PROTECTED_FILE_PATTERNS:
-        if re.search(pattern, file_path, re.IGNORECASE):
-            return True, f"Blocked access to protected file: {file_path}"
+    if _PROTECTED_FILE_RE.search(file_path):
+        return True, f"Blocked access to protected file: {file_path}"
 
-    for protected_path in PROTECTED_PATHS:
-        if protected_path in file_path:
-            return True, f"Blocked access to protected path: {protected_path}"
+    path_hit = _PROTECTED_PATH_RE.search(file_path)
+    if path_hit:
+        return True, f"Blocked access to protected path: {path_hit.group(0)}"
 
     return False, ""
 
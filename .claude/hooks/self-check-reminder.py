@@ -18,10 +18,20 @@ import json
 import os
 import re
 import sys
+from bisect import bisect_left
 from pathlib import Path
 from typing import NamedTuple
 
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+
 class RiskPattern(NamedTuple):
     name: str
     pattern: str
@@ -75,6 +85,64 @@ RISK_PATTERNS: list[RiskPattern] = [
 ]
 
 
+def _combined_regex(patterns: list[RiskPattern]) -> re.Pattern[bytes]:
+    """One alternation with a named group per risk pattern: a single compile
+    and a single scan per file. Compiled as a bytes pattern so file contents
+    never need a UTF-8 decode pass."""
+    return re.compile(
+        b"|".join(
+            f"(?P<{p.name.replace('-', '_')}>{p.pattern})".encode("ascii")
+            for p in patterns
+        ),
+        re.IGNORECASE,
+    )
+
+
+RISK_RE = _combined_regex(RISK_PATTERNS)
+PATTERN_BY_GROUP = {p.name.replace("-", "_"): p for p in RISK_PATTERNS}
+
+# Optional fast path: Hyperscan scans patterns in one JIT'd DFA pass, but
+# rejects lookaheads outright. Only the plain patterns go into the database
+# (keyed by their RISK_PATTERNS index); the lookahead ones keep a combined
+# regex of their own, run alongside the database scan.
+_HS_PATTERN_IDS = [
+    idx
+    for idx, p in enumerate(RISK_PATTERNS)
+    if "(?!" not in p.pattern and "(?<" not in p.pattern
+]
+_HS_REST_RE = _combined_regex(
+    [p for idx, p in enumerate(RISK_PATTERNS) if idx not in _HS_PATTERN_IDS]
+)
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+_hs_db = None
+
+
+def _get_hs_db():
+    global _hs_db, hyperscan
+
+    if hyperscan is not None and _hs_db is None:
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[
+                    RISK_PATTERNS[idx].pattern.encode("ascii")
+                    for idx in _HS_PATTERN_IDS
+                ],
+                ids=_HS_PATTERN_IDS,
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST]
+                * len(_HS_PATTERN_IDS),
+            )
+            _hs_db = db
+        except Exception:
+            hyperscan = None
+    return _hs_db
+
+
 def get_project_root() -> Path:
     return Path(os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()))
 
@@ -87,39 +155,30 @@ def get_edited_files(session_id: str) -> list[str]:
     cache_dir = get_cache_dir(session_id)
     log_file = cache_dir / "edited-files.log"
 
-    if not log_file.exists():
-        return []
-
     files: set[str] = set()
-    with open(log_file, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-
-            # JSON Lines format: {"ts": "...", "file": "path/to/file.ts"}
-            if line.startswith("{"):
-                try:
-                    entry = json.loads(line)
-                    filepath = entry.get("file", "")
-                    if filepath:
-                        files.add(filepath)
-                    continue
-                except json.JSONDecodeError:
-                    pass
-
-            # Legacy format: 2026-02-01T17:10:16+00:00:filepath
-            idx = line.rfind("+00:00:")
-            if idx != -1:
-                filepath = line[idx + 7 :]
-            else:
-                idx = line.find(":", 25)
-                if idx != -1:
-                    filepath = line[idx + 1 :]
-                else:
+    try:
+        with open(log_file, "rb") as f:
+            for raw in f:
+                raw = raw.strip()
+                if not raw:
                     continue
-            if filepath:
-                files.add(filepath)
+
+                # JSON Lines format: {"ts": "...", "file": "path/to/file.ts"}
+                if raw[:1] == b"{":
+                    try:
+                        filepath = _loads(raw).get("file", "")
+                        if filepath:
+                            files.add(filepath)
+                        continue
+                    except ValueError:
+                        pass
+
+                # Legacy format: 2026-02-01T17:10:16+00:00:filepath
+                idx = raw.rfind(b"+00:00:")
+                if idx != -1 and raw[idx + 7 :]:
+                    files.add(raw[idx + 7 :].decode("utf-8"))
+    except OSError:
+        return []
 
     return list(files)
 
@@ -133,24 +192,49 @@ def analyze_file(file_path: str) -> list[Finding]:
     project_root = get_project_root()
     absolute_path = project_root / file_path
 
-    if not absolute_path.exists():
-        return []
-
     try:
-        content = absolute_path.read_text(encoding="utf-8")
-    except Exception:
+        content = absolute_path.read_bytes()
+    except OSError:
         return []
 
-    lines = content.split("\n")
-    findings: list[Finding] = []
+    # Newline offsets let one finditer pass over the whole content replace
+    # the per-line split and scan; line numbers come from a bisect lookup
+    newline_offsets = []
+    offset = content.find(b"\n")
+    while offset != -1:
+        newline_offsets.append(offset)
+        offset = content.find(b"\n", offset + 1)
+
+    db = _get_hs_db()
+    if db is not None:
+        seen: set[tuple[int, int]] = set()
+
+        def on_match(pattern_id, start, end, flags, ctx):
+            line = bisect_left(newline_offsets, start) + 1
+            seen.add((pattern_id, line))
+
+        db.scan(content, match_event_handler=on_match)
+        findings = [
+            Finding(pattern=RISK_PATTERNS[pattern_id], line=line)
+            for pattern_id, line in sorted(seen)
+        ]
+        for match in _HS_REST_RE.finditer(content):
+            findings.append(
+                Finding(
+                    pattern=PATTERN_BY_GROUP[match.lastgroup],
+                    line=bisect_left(newline_offsets, match.start()) + 1,
+                )
+            )
+        return findings
 
-    for pattern in RISK_PATTERNS:
-        regex = re.compile(
-            pattern.pattern, re.IGNORECASE if "sql" in pattern.name else 0
+    findings: list[Finding] = []
+    for match in RISK_RE.finditer(content):
+        findings.append(
+            Finding(
+                pattern=PATTERN_BY_GROUP[match.lastgroup],
+                line=bisect_left(newline_offsets, match.start()) + 1,
+            )
         )
-        for i, line in enumerate(lines):
-            if regex.search(line):
-                findings.append(Finding(pattern=pattern, line=i + 1))
 
     return findings
 
@@ -204,8 +288,8 @@ def main() -> None:
         sys.exit(0)
 
     try:
-        data = json.loads(input_data)
-    except json.JSONDecodeError:
+        data = _loads(input_data)
+    except ValueError:
         sys.exit(0)
 
     session_id = data.get("session_id", "default")
@@ -15,12 +15,20 @@ Usage:
     python3 memory-loader.py --search="query"
 """
 
-import argparse
 import json
 import os
-from collections import defaultdict
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 CLAUDE_PROJECT_DIR = os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())
 MEMORY_DIR = Path(CLAUDE_PROJECT_DIR) / ".claude" / "memory"
 
@@ -28,31 +36,111 @@ LEARNINGS_FILE = MEMORY_DIR / "learnings.json"
 DECISIONS_FILE = MEMORY_DIR / "decisions.json"
 INDEX_FILE = MEMORY_DIR / "index.json"
 COMODS_FILE = MEMORY_DIR / "co-modifications.json"
+MEMORY_FILE = MEMORY_DIR / "memory.json"
+
+
+@lru_cache(maxsize=8)
+def _parse_json_file(path_str: str, mtime_ns: int, size: int) -> dict:
+    return _loads(Path(path_str).read_bytes())
 
 
 def load_json(file_path: Path, default: dict) -> dict:
-    if not file_path.exists():
-        return default
+    """Load a JSON file, memoized per (path, mtime, size) within the process.
+
+    Repeat reads of the same unchanged file return the already-parsed object
+    instead of re-decoding it.
+    """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
+        stat = file_path.stat()
+        return _parse_json_file(str(file_path), stat.st_mtime_ns, stat.st_size)
+    except (OSError, ValueError):
         return default
 
 
+@dataclass(slots=True)
+class Learning:
+    """Entry view with slot attributes: read loops skip per-field dict
+    lookups, and unknown keys from older files are dropped by from_dict."""
+
+    lesson: str = ""
+    context: str = ""
+    category: str = "general"
+    timestamp: str = "unknown"
+    session_id: str = "unknown"
+    _h50: str = ""
+    _h60: str = ""
+    _h80: str = ""
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Learning":
+        known = cls.__dataclass_fields__
+        return cls(**{key: value for key, value in raw.items() if key in known})
+
+
+@dataclass(slots=True)
+class Decision:
+    decision: str = ""
+    rationale: str = ""
+    alternatives: list = None
+    timestamp: str = "unknown"
+    session_id: str = "unknown"
+    _h60: str = ""
+    _h80: str = ""
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Decision":
+        known = cls.__dataclass_fields__
+        return cls(**{key: value for key, value in raw.items() if key in known})
+
+
+def _load_memory() -> dict:
+    """Consolidated memory.json: learnings, decisions and comods in one read.
+
+    load_json's cache means every layer function shares a single parse.
+    """
+    return load_json(MEMORY_FILE, {})
+
+
+_learnings_cache: list = None
+_decisions_cache: list = None
+
+
 def get_learnings() -> list:
-    data = load_json(LEARNINGS_FILE, {"entries": []})
-    return data.get("entries", [])
+    global _learnings_cache
+    if _learnings_cache is None:
+        consolidated = _load_memory()
+        if "learnings" in consolidated:
+            raw_entries = consolidated["learnings"]
+        else:
+            raw_entries = load_json(LEARNINGS_FILE, {"entries": []}).get("entries", [])
+        _learnings_cache = [Learning.from_dict(e) for e in raw_entries]
+    return _learnings_cache
 
 
 def get_decisions() -> list:
-    data = load_json(DECISIONS_FILE, {"decisions": []})
-    return data.get("decisions", [])
+    global _decisions_cache
+    if _decisions_cache is None:
+        consolidated = _load_memory()
+        if "decisions" in consolidated:
+            raw_decisions = consolidated["decisions"]
+        else:
+            raw_decisions = load_json(DECISIONS_FILE, {"decisions": []}).get(
+                "decisions", []
+            )
+        _decisions_cache = [Decision.from_dict(e) for e in raw_decisions]
+    return _decisions_cache
 
 
 def get_comods() -> list:
-    data = load_json(COMODS_FILE, {"pairs": []})
-    return data.get("pairs", [])
+    consolidated = _load_memory()
+    if "comods" in consolidated:
+        pairs = consolidated["comods"]
+    else:
+        pairs = load_json(COMODS_FILE, {"pairs": []}).get("pairs", [])
+    if isinstance(pairs, dict):
+        # Keyed storage layout: NUL-joined file pair -> frequency info
+        return [{"files": key.split("\0"), **info} for key, info in pairs.items()]
+    return pairs
 
 
 def get_index() -> dict:
@@ -67,6 +155,7 @@ def layer_summary() -> str:
     Falls back to loading full files if index is missing.
     """
     lines = ["## Cross-Session Memory Loaded", ""]
+    learnings = None
 
     # Try fast path: use index.json
     index = get_index()
@@ -78,11 +167,18 @@ def layer_summary() -> str:
         total_learnings = learnings_info.get("total", 0)
         total_decisions = decisions_info.get("total", 0)
         by_category = learnings_info.get("by_category", {})
+        recent_headlines = learnings_info.get("recent_headlines")
 
-        # Get comods count (still need to check file for frequency filter)
-        comods = get_comods()
-        comods_count = len([p for p in comods if p.get("frequency", 0) >= 2])
+        comods_summary = summary.get("comods")
+        if comods_summary is not None:
+            comods_count = comods_summary.get("high_freq_count", 0)
+        else:
+            # Older index without the comods aggregate: check the file
+            comods = get_comods()
+            comods_count = len([p for p in comods if p.get("frequency", 0) >= 2])
     else:
+        from collections import defaultdict
+
         # Fallback: load full files (slower but always works)
         learnings = get_learnings()
         decisions = get_decisions()
@@ -90,13 +186,13 @@ def layer_summary() -> str:
 
         by_category = defaultdict(int)
         for entry in learnings:
-            cat = entry.get("category", "general")
-            by_category[cat] += 1
+            by_category[entry.category] += 1
         by_category = dict(by_category)
 
         total_learnings = len(learnings)
         total_decisions = len(decisions)
         comods_count = len([p for p in comods if p.get("frequency", 0) >= 2])
+        recent_headlines = None
 
     lines.append(f"**Learnings:** {total_learnings} | **Decisions:** {total_decisions}")
 
@@ -113,13 +209,17 @@ def layer_summary() -> str:
     if total_learnings > 0:
         lines.append("")
         lines.append("### Recent Learnings")
-        # Load just last 3 for preview (minimal overhead)
-        learnings = get_learnings()
-        for entry in learnings[-3:]:
-            lesson = entry.get("lesson", "")
-            cat = entry.get("category", "general")
-            headline = lesson[:50] + "..." if len(lesson) > 50 else lesson
-            lines.append(f"- [{cat}] {headline}")
+        if recent_headlines is not None:
+            # Precomputed by the writer: no need to open learnings.json
+            for cat, headline in recent_headlines:
+                lines.append(f"- [{cat}] {headline}")
+        else:
+            # Reuse the already-loaded list when the fallback path ran
+            if learnings is None:
+                learnings = get_learnings()
+            for entry in learnings[-3:]:
+                headline = entry._h50 or _truncate(entry.lesson, 50)
+                lines.append(f"- [{entry.category}] {headline}")
 
     lines.append("")
     lines.append(
@@ -129,33 +229,55 @@ def layer_summary() -> str:
     return "\n".join(lines)
 
 
+def _truncate(text: str, width: int) -> str:
+    return text[:width] + "..." if len(text) > width else text
+
+
 def layer_headlines(category: str = None) -> str:
-    """Layer 2: One-liners per entry (~200-400 tokens)"""
-    learnings = get_learnings()
-    decisions = get_decisions()
+    """Layer 2: One-liners per entry (~200-400 tokens)
+
+    Headlines are pre-truncated in index.json at write time; the full files
+    are only parsed when the index is missing.
+    """
+    index = get_index()
+    index_headlines = index.get("headlines")
+    if index_headlines is not None:
+        learning_rows = index_headlines.get("learnings", [])
+        decision_rows = index_headlines.get("decisions", [])
+    else:
+        learning_rows = [
+            [entry.category, entry._h80 or _truncate(entry.lesson, 80)]
+            for entry in get_learnings()
+        ]
+        decision_rows = [
+            entry._h80 or _truncate(entry.decision, 80) for entry in get_decisions()
+        ]
 
     lines = ["## Memory Headlines", ""]
 
-    if learnings:
+    if learning_rows:
         lines.append("### Learnings")
-        for idx, entry in enumerate(learnings):
-            cat = entry.get("category", "general")
-            if category and cat != category:
-                continue
-            lesson = entry.get("lesson", "")
-            headline = lesson[:80] + "..." if len(lesson) > 80 else lesson
-            lines.append(f"  {idx}. [{cat}] {headline}")
+        category_ids = index.get("by_category_ids", {}).get(category) if category else None
+        if category_ids is not None and index_headlines is not None:
+            # Per-category id list: touch only the matching entries
+            for idx in category_ids:
+                if idx < len(learning_rows):
+                    cat, headline = learning_rows[idx]
+                    lines.append(f"  {idx}. [{cat}] {headline}")
+        else:
+            for idx, (cat, headline) in enumerate(learning_rows):
+                if category and cat != category:
+                    continue
+                lines.append(f"  {idx}. [{cat}] {headline}")
         lines.append("")
 
-    if decisions and not category:
+    if decision_rows and not category:
         lines.append("### Decisions")
-        for idx, entry in enumerate(decisions):
-            decision = entry.get("decision", "")
-            headline = decision[:80] + "..." if len(decision) > 80 else decision
+        for idx, headline in enumerate(decision_rows):
             lines.append(f"  D{idx}. {headline}")
         lines.append("")
 
-    if not learnings and not decisions:
+    if not learning_rows and not decision_rows:
         lines.append("No entries found.")
 
     lines.append("")
@@ -166,53 +288,79 @@ def layer_headlines(category: str = None) -> str:
     return "\n".join(lines)
 
 
+def _entry_at(file_path: Path, array_key: str, idx: int) -> dict | None:
+    """Fetch the idx-th element of the top-level array without materializing
+    the rest of the file when ijson is available."""
+    if idx < 0:
+        return None
+
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+    if ijson is not None:
+        from itertools import islice
+
+        try:
+            with open(file_path, "rb") as f:
+                items = ijson.items(f, f"{array_key}.item")
+                return next(islice(items, idx, idx + 1), None)
+        except OSError:
+            return None
+
+    entries = load_json(file_path, {}).get(array_key, [])
+    return entries[idx] if idx < len(entries) else None
+
+
 def layer_details(entry_id: str = None, category: str = None) -> str:
     """Layer 3: Full entries with context (~500-1000 tokens)"""
-    learnings = get_learnings()
-    decisions = get_decisions()
-
     lines = ["## Memory Details", ""]
 
     if entry_id is not None:
-        if entry_id.startswith("D") or entry_id.startswith("d"):
-            idx = int(entry_id[1:])
-            if 0 <= idx < len(decisions):
-                entry = decisions[idx]
+        is_decision = entry_id[:1] in ("D", "d")
+        try:
+            idx = int(entry_id[1:]) if is_decision else int(entry_id)
+        except ValueError:
+            idx = -1
+
+        if is_decision:
+            raw = _entry_at(DECISIONS_FILE, "decisions", idx)
+            if raw is not None:
+                entry = Decision.from_dict(raw)
                 lines.append(f"### Decision D{idx}")
-                lines.append(f"**Decision:** {entry.get('decision', '')}")
-                if entry.get("rationale"):
-                    lines.append(f"**Rationale:** {entry.get('rationale')}")
-                if entry.get("alternatives"):
-                    lines.append(
-                        f"**Alternatives:** {', '.join(entry.get('alternatives', []))}"
-                    )
-                lines.append(f"**Timestamp:** {entry.get('timestamp', 'unknown')}")
-                lines.append(f"**Session:** {entry.get('session_id', 'unknown')}")
+                lines.append(f"**Decision:** {entry.decision}")
+                if entry.rationale:
+                    lines.append(f"**Rationale:** {entry.rationale}")
+                if entry.alternatives:
+                    lines.append(f"**Alternatives:** {', '.join(entry.alternatives)}")
+                lines.append(f"**Timestamp:** {entry.timestamp}")
+                lines.append(f"**Session:** {entry.session_id}")
             else:
-                lines.append(f"Decision D{idx} not found.")
+                lines.append(f"Decision {entry_id} not found.")
         else:
-            idx = int(entry_id)
-            if 0 <= idx < len(learnings):
-                entry = learnings[idx]
+            raw = _entry_at(LEARNINGS_FILE, "entries", idx)
+            if raw is not None:
+                entry = Learning.from_dict(raw)
                 lines.append(f"### Learning {idx}")
-                lines.append(f"**Category:** {entry.get('category', 'general')}")
-                lines.append(f"**Lesson:** {entry.get('lesson', '')}")
-                if entry.get("context"):
-                    lines.append(f"**Context:** {entry.get('context')}")
-                lines.append(f"**Timestamp:** {entry.get('timestamp', 'unknown')}")
-                lines.append(f"**Session:** {entry.get('session_id', 'unknown')}")
+                lines.append(f"**Category:** {entry.category}")
+                lines.append(f"**Lesson:** {entry.lesson}")
+                if entry.context:
+                    lines.append(f"**Context:** {entry.context}")
+                lines.append(f"**Timestamp:** {entry.timestamp}")
+                lines.append(f"**Session:** {entry.session_id}")
             else:
-                lines.append(f"Learning {idx} not found.")
+                lines.append(f"Learning {entry_id} not found.")
     elif category:
         found = False
-        for idx, entry in enumerate(learnings):
-            if entry.get("category", "general") == category:
+        for idx, entry in enumerate(get_learnings()):
+            if entry.category == category:
                 found = True
                 lines.append(f"### Learning {idx}")
-                lines.append(f"**Lesson:** {entry.get('lesson', '')}")
-                if entry.get("context"):
-                    lines.append(f"**Context:** {entry.get('context')}")
-                lines.append(f"**Timestamp:** {entry.get('timestamp', 'unknown')}")
+                lines.append(f"**Lesson:** {entry.lesson}")
+                if entry.context:
+                    lines.append(f"**Context:** {entry.context}")
+                lines.append(f"**Timestamp:** {entry.timestamp}")
                 lines.append("")
         if not found:
             lines.append(f"No learnings found for category '{category}'.")
@@ -222,8 +370,73 @@ def layer_details(entry_id: str = None, category: str = None) -> str:
     return "\n".join(lines)
 
 
+def _any_file_contains(file_paths: list[Path], pattern) -> bool:
+    """Case-insensitive bytes scan over the mapped files, no JSON involved."""
+    import mmap
+
+    for file_path in file_paths:
+        try:
+            with open(file_path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            continue
+        try:
+            if pattern.search(mm) is not None:
+                return True
+        finally:
+            mm.close()
+    return False
+
+
+def _stat_mtime_ns(file_path: Path) -> int:
+    try:
+        return file_path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
 def search_memory(query: str) -> str:
-    """Search learnings and decisions by substring match."""
+    """Search with repeat-query memoization: results are cached per query
+    and memory-file mtimes, so identical queries against unchanged files
+    return without rescanning."""
+    return _search_impl(
+        query,
+        _stat_mtime_ns(MEMORY_FILE),
+        _stat_mtime_ns(LEARNINGS_FILE),
+        _stat_mtime_ns(DECISIONS_FILE),
+    )
+
+
+@lru_cache(maxsize=64)
+def _search_impl(
+    query: str, memory_mtime_ns: int, learnings_mtime_ns: int, decisions_mtime_ns: int
+) -> str:
+    """Search learnings and decisions by substring match.
+
+    A raw mmap scan over the memory files rejects no-hit queries before any
+    JSON is parsed.
+    """
+    import re
+
+    # The prefilter compares raw JSON bytes, so it is only sound for queries
+    # that serialize to themselves (no JSON escaping, ASCII case folding)
+    if re.fullmatch(r"[ \w.-]+", query) and query.isascii():
+        # Pick sources the way the getters pick data: memory.json may hold
+        # only comods (the tracker rewrites it every Stop), so each kind
+        # falls back to its per-kind file unless its key is really there.
+        # load_json's cache makes the extra parse free.
+        consolidated = _load_memory()
+        source_files = []
+        if "learnings" in consolidated or "decisions" in consolidated:
+            source_files.append(MEMORY_FILE)
+        if "learnings" not in consolidated:
+            source_files.append(LEARNINGS_FILE)
+        if "decisions" not in consolidated:
+            source_files.append(DECISIONS_FILE)
+        raw_pattern = re.compile(re.escape(query).encode("utf-8"), re.IGNORECASE)
+        if not _any_file_contains(source_files, raw_pattern):
+            return f"## Search Results for '{query}'\n\nNo matches found."
+
     learnings = get_learnings()
     decisions = get_decisions()
     query_lower = query.lower()
@@ -232,32 +445,28 @@ def search_memory(query: str) -> str:
 
     found_learnings = []
     for idx, entry in enumerate(learnings):
-        lesson = entry.get("lesson", "").lower()
-        context = entry.get("context", "").lower()
-        if query_lower in lesson or query_lower in context:
+        if query_lower in entry.lesson.lower() or query_lower in entry.context.lower():
             found_learnings.append((idx, entry))
 
     found_decisions = []
     for idx, entry in enumerate(decisions):
-        decision = entry.get("decision", "").lower()
-        rationale = entry.get("rationale", "").lower()
-        if query_lower in decision or query_lower in rationale:
+        if (
+            query_lower in entry.decision.lower()
+            or query_lower in entry.rationale.lower()
+        ):
             found_decisions.append((idx, entry))
 
     if found_learnings:
         lines.append(f"### Learnings ({len(found_learnings)} matches)")
         for idx, entry in found_learnings:
-            cat = entry.get("category", "general")
-            lesson = entry.get("lesson", "")
-            headline = lesson[:60] + "..." if len(lesson) > 60 else lesson
-            lines.append(f"  {idx}. [{cat}] {headline}")
+            headline = entry._h60 or _truncate(entry.lesson, 60)
+            lines.append(f"  {idx}. [{entry.category}] {headline}")
         lines.append("")
 
     if found_decisions:
         lines.append(f"### Decisions ({len(found_decisions)} matches)")
         for idx, entry in found_decisions:
-            decision = entry.get("decision", "")
-            headline = decision[:60] + "..." if len(decision) > 60 else decision
+            headline = entry._h60 or _truncate(entry.decision, 60)
             lines.append(f"  D{idx}. {headline}")
         lines.append("")
 
@@ -268,22 +477,33 @@ def search_memory(query: str) -> str:
 
 
 def layer_comods() -> str:
-    """Show co-modification pairs with frequency >= 2."""
-    comods = get_comods()
-    high_freq = [p for p in comods if p.get("frequency", 0) >= 2]
-    high_freq.sort(key=lambda p: p.get("frequency", 0), reverse=True)
+    """Show co-modification pairs with frequency >= 2.
+
+    The tracker maintains a pre-sorted aggregate in index.json; the full
+    comods file is only read when that aggregate is missing.
+    """
+    comods_summary = get_index().get("summary", {}).get("comods")
+    if comods_summary is not None:
+        total = comods_summary.get("high_freq_count", 0)
+        top_pairs = comods_summary.get("top", [])
+    else:
+        comods = get_comods()
+        high_freq = [p for p in comods if p.get("frequency", 0) >= 2]
+        high_freq.sort(key=lambda p: p.get("frequency", 0), reverse=True)
+        total = len(high_freq)
+        top_pairs = high_freq[:10]
 
     lines = ["## Co-modification Patterns", ""]
 
-    if not high_freq:
+    if not total:
         lines.append("No significant co-modification patterns detected yet.")
         lines.append("(Pairs must be edited together in 2+ sessions to appear here.)")
         return "\n".join(lines)
 
-    lines.append(f"Found {len(high_freq)} file pairs frequently edited together:")
+    lines.append(f"Found {total} file pairs frequently edited together:")
     lines.append("")
 
-    for pair in high_freq[:10]:
+    for pair in top_pairs:
         files = pair.get("files", [])
         freq = pair.get("frequency", 0)
         last_seen = pair.get("last_seen", "unknown")
@@ -297,7 +517,23 @@ def layer_comods() -> str:
     return "\n".join(lines)
 
 
+def _emit(output: str) -> None:
+    """One write syscall for the whole response instead of print's
+    line-buffered chunking."""
+    sys.stdout.buffer.write(output.encode("utf-8") + b"\n")
+
+
 def main():
+    # Fast path for the by-far most common invocations (session start loads
+    # the summary, with no arguments or an explicit --layer=summary): skip
+    # argparse construction entirely.
+    argv = sys.argv[1:]
+    if not argv or argv == ["--layer=summary"] or argv == ["--layer", "summary"]:
+        _emit(layer_summary())
+        return
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Memory Loader - Progressive Disclosure"
     )
@@ -313,17 +549,17 @@ def main():
     args = parser.parse_args()
 
     if args.search:
-        print(search_memory(args.search))
-    elif args.layer == "summary":
-        print(layer_summary())
+        output = search_memory(args.search)
     elif args.layer == "headlines":
-        print(layer_headlines(args.category))
+        output = layer_headlines(args.category)
     elif args.layer == "details":
-        print(layer_details(args.id, args.category))
+        output = layer_details(args.id, args.category)
     elif args.layer == "comods":
-        print(layer_comods())
+        output = layer_comods()
     else:
-        print(layer_summary())
+        output = layer_summary()
+
+    _emit(output)
 
 
 if __name__ == "__main__":
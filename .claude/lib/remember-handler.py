@@ -5,6 +5,10 @@ Remember Handler - Writes learnings/decisions/preferences to session storage.
 Called by Claude when user invokes /remember command.
 At session end, memory-writer.py persists these to permanent memory.
 
+Learnings and decisions are stored as JSON Lines so each /remember is a
+single O(1) append rather than a load-rewrite of the whole session file.
+Preferences stay as one keyed JSON object.
+
 Usage:
     python3 remember-handler.py learning "Always use parameterized queries"
     python3 remember-handler.py learning "Always use parameterized queries" --context "Discovered during database work"
@@ -22,86 +26,77 @@ from pathlib import Path
 
 CLAUDE_PROJECT_DIR = os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())
 STATE_DIR = Path(CLAUDE_PROJECT_DIR) / ".claude" / "state"
-SESSION_FILE = STATE_DIR / "session-learnings.json"
+LEARNINGS_FILE = STATE_DIR / "session-learnings.jsonl"
+DECISIONS_FILE = STATE_DIR / "session-decisions.jsonl"
+PREFERENCES_FILE = STATE_DIR / "session-preferences.json"
+
 
+def append_session_entry(file_path: Path, entry: dict) -> None:
+    """Append one JSON line; no read or re-serialize of existing entries.
 
-def load_session_data() -> dict:
-    """Load current session learnings or create empty structure."""
+    O_APPEND writes below PIPE_BUF are atomic on Linux, so concurrent
+    /remember invocations can't interleave lines.
+    """
     STATE_DIR.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n"
+    fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
 
-    if SESSION_FILE.exists():
-        try:
-            with open(SESSION_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            pass
-
-    # Get session ID from session-context.json if available
-    session_id = "unknown"
-    context_file = STATE_DIR / "session-context.json"
-    if context_file.exists():
-        try:
-            with open(context_file, "r", encoding="utf-8") as f:
-                ctx = json.load(f)
-                session_id = ctx.get("session_id", "unknown")
-        except (json.JSONDecodeError, IOError):
-            pass
-
-    return {
-        "session_id": session_id,
-        "learnings": [],
-        "decisions": [],
-        "preferences": {},
-    }
-
-
-def save_session_data(data: dict) -> None:
-    """Save session learnings to file."""
+def load_preferences() -> dict:
+    try:
+        return json.loads(PREFERENCES_FILE.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_preferences(preferences: dict) -> None:
+    """Write preferences atomically: temp file + rename, one write_bytes."""
     STATE_DIR.mkdir(parents=True, exist_ok=True)
-    with open(SESSION_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    payload = json.dumps(preferences, indent=2, ensure_ascii=False).encode("utf-8")
+    tmp_path = PREFERENCES_FILE.with_suffix(".tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, PREFERENCES_FILE)
 
 
 def add_learning(content: str, context: str = "", category: str = "general") -> str:
     """Add a learning to session storage."""
-    data = load_session_data()
-
-    entry = {
-        "lesson": content,
-        "context": context,
-        "category": category,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-    }
-
-    data["learnings"].append(entry)
-    save_session_data(data)
+    append_session_entry(
+        LEARNINGS_FILE,
+        {
+            "lesson": content,
+            "context": context,
+            "category": category,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+    )
 
     return f"✓ Learning saved [{category}]: {content[:60]}{'...' if len(content) > 60 else ''}"
 
 
 def add_decision(content: str, rationale: str = "", alternatives: list = None) -> str:
     """Add a decision to session storage."""
-    data = load_session_data()
-
-    entry = {
-        "decision": content,
-        "rationale": rationale,
-        "alternatives": alternatives or [],
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-    }
-
-    data["decisions"].append(entry)
-    save_session_data(data)
+    append_session_entry(
+        DECISIONS_FILE,
+        {
+            "decision": content,
+            "rationale": rationale,
+            "alternatives": alternatives or [],
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+    )
 
     return f"✓ Decision saved: {content[:60]}{'...' if len(content) > 60 else ''}"
 
 
 def add_preference(key: str, value: str) -> str:
     """Add or update a preference."""
-    data = load_session_data()
-
-    data["preferences"][key] = value
-    save_session_data(data)
+    preferences = load_preferences()
+    preferences[key] = value
+    save_preferences(preferences)
 
     return f"✓ Preference saved: {key} = {value}"
 